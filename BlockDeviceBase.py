@@ -0,0 +1,201 @@
+from DeviceDriverSimulator import DeviceDriverSimulator
+import logging
+import random
+import time
+from array import array
+
+# Estados de bloque en `block_state`
+FREE, USED = 0, 1
+
+log = logging.getLogger(__name__)
+
+class BlockDeviceBase(DeviceDriverSimulator.Device):
+    """
+    Base común de los dispositivos de almacenamiento por bloques.
+    Implementa el almacenamiento, la latencia y los fallos simulados, y el
+    flujo de lectura/escritura (individual o por lotes); las subclases ajustan los pasos
+    con `_ready`, `_commit` y `_fetch`.
+    """
+    __slots__ = ("block_size", "total_blocks", "storage", "block_len", "block_state",
+                 "_used_count", "failure_chance", "_rng", "_latencies", "_rolls", "_lat_i", "_roll_i")
+
+    RING_SIZE = 4096           # Potencia de 2: el índice se envuelve con una máscara
+    LATENCY_MS = (10, 100)     # Rango de latencia simulada
+    READ_FAILURE = "[READ FAILURE]"
+
+    def __init__(self, name, capacity, block_size, failure_chance, seed=None):
+        super().__init__(name)
+        self.block_size = block_size
+        self.total_blocks = capacity // block_size
+
+        # Almacenamiento en estructura de arreglos (SoA): un buffer contiguo de
+        # total_blocks * block_size bytes, la longitud ocupada de cada bloque y
+        # un byte de estado por bloque (FREE/USED).
+        self.storage = bytearray(self.total_blocks * block_size)
+        self.block_len = array("I", [0]) * self.total_blocks
+        self.block_state = bytearray(self.total_blocks)
+        self._used_count = 0  # Bloques en estado USED, mantenido en cada cambio de estado
+
+        # Probabilidad de error simulada (por bloque)
+        self.failure_chance = failure_chance
+
+        # Generador propio del dispositivo; con `seed` la simulación es reproducible
+        self._rng = random.Random(seed)
+
+        # Latencias y sorteos de fallo precalculados, consumidos en anillo
+        min_ms, max_ms = self.LATENCY_MS
+        self._latencies = [self._rng.uniform(min_ms, max_ms) / 1000.0 for _ in range(self.RING_SIZE)]
+        self._rolls = [self._rng.random() for _ in range(self.RING_SIZE)]
+        self._lat_i = 0
+        self._roll_i = 0
+
+    def simulate_latency(self, count=1):
+        """
+        Simula latencia del dispositivo (rango LATENCY_MS, precalculada).
+        Para `count` operaciones se espera la suma de sus latencias de una vez.
+        """
+        mask = self.RING_SIZE - 1
+        start = self._lat_i
+        if count == 1:
+            delay = self._latencies[start]
+        else:
+            delay = sum(self._latencies[(start + k) & mask] for k in range(count))
+        self._lat_i = (start + count) & mask
+        time.sleep(delay)
+
+    def simulate_failure(self):
+        """Simula un posible fallo de hardware."""
+        roll = self._rolls[self._roll_i]
+        self._roll_i = (self._roll_i + 1) & (self.RING_SIZE - 1)
+        return roll < self.failure_chance
+
+    def write_block(self, block_num, data):
+        """
+        Escribe datos en un bloque específico.
+
+        Args:
+            block_num (int): Número del bloque.
+            data (str): Datos a escribir.
+
+        Returns:
+            bool: True si tuvo éxito, False si hubo error simulado.
+        """
+        return self.write_blocks([block_num], [data])[0]
+
+    def read_block(self, block_num):
+        """
+        Lee los datos de un bloque específico.
+
+        Args:
+            block_num (int): Número del bloque.
+
+        Returns:
+            str: Contenido del bloque o mensaje de error.
+        """
+        return self.read_blocks([block_num])[0]
+
+    def write_blocks(self, block_nums, datas):
+        """
+        Escribe varios bloques como una sola operación: una única espera por
+        la latencia acumulada y un resumen en el log.
+
+        Args:
+            block_nums (list[int]): Números de bloque.
+            datas (list[str]): Datos a escribir en cada bloque.
+
+        Returns:
+            list[bool]: Resultado de cada escritura.
+
+        Raises:
+            ValueError: Si `block_nums` y `datas` tienen longitudes distintas.
+        """
+        if len(block_nums) != len(datas):
+            raise ValueError(f"{len(block_nums)} block numbers but {len(datas)} data items.")
+        if not self._ready():
+            return [False] * len(block_nums)
+        results = [self._in_range(block_num) for block_num in block_nums]
+
+        self.simulate_latency(sum(results))
+        for i, (block_num, data) in enumerate(zip(block_nums, datas)):
+            if not results[i]:
+                continue
+            if self.simulate_failure():
+                log.warning("[FAILURE] %s: Write failure on block %d!", self.name, block_num)
+                results[i] = False
+                continue
+            self._commit(block_num, data)
+            log.debug("[WRITE] %s: Block %d <- '%.30s...'", self.name, block_num, data)
+
+        if len(block_nums) > 1:
+            log.info("[WRITE] %s: %d/%d blocks written.", self.name, sum(results), len(block_nums))
+        return results
+
+    def read_blocks(self, block_nums):
+        """
+        Lee varios bloques como una sola operación: una única espera por la
+        latencia acumulada y un resumen en el log.
+
+        Args:
+            block_nums (list[int]): Números de bloque.
+
+        Returns:
+            list[str]: Contenido de cada bloque o mensaje de error.
+        """
+        if not self._ready():
+            return [""] * len(block_nums)
+        in_range = [self._in_range(block_num) for block_num in block_nums]
+
+        self.simulate_latency(sum(in_range))
+        results = []
+        failures = 0
+        for block_num, ok in zip(block_nums, in_range):
+            if not ok:
+                results.append("")
+                continue
+            if self.simulate_failure():
+                log.warning("[FAILURE] %s: Read failure on block %d!", self.name, block_num)
+                results.append(self.READ_FAILURE)
+                failures += 1
+                continue
+            data = self._fetch(block_num)
+            log.debug("[READ] %s: Block %d -> '%.30s...'", self.name, block_num, data)
+            results.append(data)
+
+        if len(block_nums) > 1:
+            log.info("[READ] %s: %d/%d blocks read.", self.name,
+                     sum(in_range) - failures, len(block_nums))
+        return results
+
+    def _ready(self):
+        """Indica si el dispositivo puede atender operaciones."""
+        return True
+
+    def _in_range(self, block_num):
+        if not 0 <= block_num < self.total_blocks:
+            log.error("[ERROR] %s: Block %d out of range.", self.name, block_num)
+            return False
+        return True
+
+    def _commit(self, block_num, data):
+        """Guarda los datos de una escritura exitosa y marca el bloque como usado."""
+        self._store(block_num, data)
+        if self.block_state[block_num] != USED:
+            self.block_state[block_num] = USED
+            self._used_count += 1
+
+    def _fetch(self, block_num):
+        """Obtiene los datos de una lectura exitosa."""
+        return self._read_from_storage(block_num)
+
+    def _store(self, block_num, data):
+        """Copia `data` (truncado a block_size bytes) al bloque."""
+        raw = data.encode()[:self.block_size]
+        start = block_num * self.block_size
+        self.storage[start:start + len(raw)] = raw
+        self.block_len[block_num] = len(raw)
+
+    def _read_from_storage(self, block_num):
+        """Retorna el contenido del bloque como texto."""
+        start = block_num * self.block_size
+        raw = self.storage[start:start + self.block_len[block_num]]
+        return raw.decode(errors="ignore")
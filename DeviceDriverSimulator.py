@@ -1,8 +1,9 @@
+import asyncio
+import logging
 import time
 from collections import deque
-from InternalMemoryDevice import InternalMemoryDevice
-from RemovableMemoryDevice import RemovableMemoryDevice
-from KeyboardDevice import KeyboardDriverSimulator
+
+log = logging.getLogger(__name__)
 
 
 class DeviceDriverSimulator:
@@ -13,6 +14,8 @@ class DeviceDriverSimulator:
 
     class Device:
         """Representa un dispositivo físico en el sistema."""
+        __slots__ = ("name", "busy", "buffer")
+
         def __init__(self, name):
             self.name = name        # Nombre del dispositivo (e.g., Printer)
             self.busy = False       # Estado del dispositivo (ocupado o libre)
@@ -20,32 +23,81 @@ class DeviceDriverSimulator:
 
     class IORequest:
         """Representa una solicitud de E/S por parte de un proceso de usuario."""
+        __slots__ = ("device_id", "operation", "data")
+
         def __init__(self, device_id, operation, data=""):
             self.device_id = device_id  # Índice del dispositivo objetivo
             self.operation = operation  # Tipo de operación: "read" o "write"
             self.data = data            # Datos a escribir (solo si es write)
 
     class RAMManager:
-        """Simula una gestión básica de memoria RAM limitada."""
-        def __init__(self, size):
+        """
+        Simula una memoria RAM limitada como un pool de bloques de tamaño fijo.
+        Los bloques libres se guardan en una pila (free-list), por lo que
+        asignar y liberar son operaciones O(1).
+        """
+        def __init__(self, size, block_size):
             self.size = size
-            self.used = 0
+            self.block_size = block_size
+            self.total_blocks = size // block_size
+            self._free = list(range(self.total_blocks))  # Pila de bloques libres
+            self._inuse = {}                             # Bloque -> bytes solicitados
+
+        @property
+        def used(self):
+            """Bytes ocupados (a granularidad de bloque)."""
+            return len(self._inuse) * self.block_size
+
+        @property
+        def free_blocks(self):
+            """Cantidad de bloques libres en el pool."""
+            return len(self._free)
+
+        @property
+        def fragmentation(self):
+            """Fragmentación externa: 1 - (mayor tramo libre contiguo / bloques libres)."""
+            if not self._free:
+                return 0.0
+            free = sorted(self._free)
+            max_run = run = 1
+            for prev, blk in zip(free, free[1:]):
+                run = run + 1 if blk == prev + 1 else 1
+                max_run = max(max_run, run)
+            return 1 - max_run / len(free)
 
         def allocate(self, amount):
-            """Solicita una cantidad de memoria. Si no hay suficiente, retorna False."""
-            if self.used + amount > self.size:
-                print(f"[RAM] Error: Not enough memory to allocate {amount} bytes.")
-                return False
-            self.used += amount
-            print(f"[RAM] Allocated {amount} bytes. Used: {self.used}/{self.size}")
-            return True
-
-        def free(self, amount):
-            """Libera una cantidad de memoria previamente asignada."""
-            self.used = max(0, self.used - amount)
-            print(f"[RAM] Freed {amount} bytes. Used: {self.used}/{self.size}")
+            """Solicita un bloque para `amount` bytes. Retorna su id o None si no hay memoria."""
+            if amount > self.block_size or not self._free:
+                log.error("[RAM] Error: Not enough memory to allocate %d bytes.", amount)
+                return None
+            blk = self._free.pop()
+            self._inuse[blk] = amount
+            log.debug("[RAM] Allocated %d bytes (block %d). Used: %d/%d", amount, blk, self.used, self.size)
+            return blk
+
+        def free(self, *blocks):
+            """Devuelve al pool uno o varios bloques previamente asignados."""
+            amount = 0
+            for blk in blocks:
+                amount += self._inuse.pop(blk)
+                self._free.append(blk)
+            log.debug("[RAM] Freed %d bytes (%d block(s)). Used: %d/%d", amount, len(blocks), self.used, self.size)
+
+    # Umbrales de coalescencia de interrupciones (por cantidad y por tiempo)
+    COALESCE_COUNT = 64
+    COALESCE_USECS = 50
+    # Máximo de solicitudes adyacentes agrupadas en una sola transferencia
+    MAX_COALESCE_COUNT = 16
+    # Operaciones de E/S soportadas por los drivers
+    OPERATIONS = ("read", "write")
 
     def __init__(self, ram_size=1024, buffer_size=128, queue_size=10):
+        # Los módulos de dispositivos heredan de DeviceDriverSimulator.Device,
+        # por lo que se importan aquí para evitar un import circular.
+        from InternalMemoryDevice import InternalMemoryDevice
+        from RemovableMemoryDevice import RemovableMemoryDevice
+        from KeyboardDevice import KeyboardDriverSimulator
+
         self.BUFFER_SIZE = buffer_size
         self.IO_QUEUE_SIZE = queue_size
         self.devices = [
@@ -53,73 +105,182 @@ class DeviceDriverSimulator:
             RemovableMemoryDevice("USB Stick", capacity=1024),
             KeyboardDriverSimulator("Keyboard")
         ]
-        self.io_queue = deque(maxlen=queue_size)
-        self.ram = self.RAMManager(ram_size)
+        # El límite IO_QUEUE_SIZE lo aplica enqueue_io; un maxlen en la deque
+        # duplicaría la comprobación y descartaría solicitudes en silencio.
+        self.io_queue = deque()
+        self.ram = self.RAMManager(ram_size, buffer_size)
+        self._ram_blocks = {}  # Dispositivo -> bloque de RAM asignado a su buffer
+        # Solicitudes en espera de que su dispositivo quede libre
+        self._waiters = {i: deque() for i in range(len(self.devices))}
+        # Tabla de drivers por operación, resuelta una sola vez al crear el simulador
+        self._drivers = {op: getattr(self, f"_{op}_driver") for op in self.OPERATIONS}
+
+        # Interrupciones pendientes de notificar (coalescencia)
+        self._pending_blocks = []
+        self._pending_completions = []
+        self._first_pending_ts = 0.0
 
     def enqueue_io(self, device_id, operation, data=""):
         """Agrega una solicitud de E/S a la cola."""
+        if operation not in self._drivers:
+            log.error("[ERROR] Unknown operation: %s", operation)
+            return
         if len(self.io_queue) >= self.IO_QUEUE_SIZE:
-            print("[SPOOLING] I/O queue is full. Request delayed.")
+            log.warning("[SPOOLING] I/O queue is full. Request delayed.")
             return
         request = self.IORequest(device_id, operation, data)
         self.io_queue.append(request)
-        print(f"[QUEUE] Enqueued {operation.upper()} on {self.devices[device_id].name}")
+        log.debug("[QUEUE] Enqueued %s on %s", operation.upper(), self.devices[device_id].name)
 
     def handle_io(self):
         """Procesa la siguiente solicitud de E/S en la cola."""
         if not self.io_queue:
-            print("[QUEUE] No pending I/O operations.")
+            log.info("[QUEUE] No pending I/O operations.")
             return
 
         req = self.io_queue.popleft()
         dev = self.devices[req.device_id]
 
         if dev.busy:
-            print(f"[BLOCKED] {dev.name} is busy. Re-enqueueing request.")
-            self.enqueue_io(req.device_id, req.operation, req.data)
+            log.debug("[BLOCKED] %s is busy. Request parked until it is released.", dev.name)
+            self._waiters[req.device_id].append(req)
             return
 
-        self._device_driver(dev, req)
-        self._interrupt_handler(dev)
+        batch = self._coalesce(req)
+        self._device_driver(dev, batch)
+        self._interrupt_handler(req.device_id)
+
+    def _coalesce(self, first):
+        """
+        Agrupa con `first` las solicitudes adyacentes de la cola dirigidas al
+        mismo dispositivo y con la misma operación, hasta MAX_COALESCE_COUNT
+        solicitudes o BUFFER_SIZE bytes de datos.
+        """
+        batch = [first]
+        size = len(first.data)
+        while self.io_queue and len(batch) < self.MAX_COALESCE_COUNT:
+            nxt = self.io_queue[0]
+            if nxt.device_id != first.device_id or nxt.operation != first.operation:
+                break
+            if size + len(nxt.data) > self.BUFFER_SIZE:
+                break
+            size += len(nxt.data)
+            batch.append(self.io_queue.popleft())
+        return batch
 
-    def _device_driver(self, dev, req):
-        """Simula la ejecución de un controlador de dispositivo (driver)."""
+    def _device_driver(self, dev, batch):
+        """
+        Simula la ejecución de un controlador de dispositivo (driver) sobre un
+        lote de solicitudes agrupadas, como una única transferencia.
+        """
         dev.busy = True
-        if req.operation == "write":
-            dev.buffer = req.data[:self.BUFFER_SIZE]
-            if self.ram.allocate(len(dev.buffer)):
-                print(f"[DEVICE] {dev.name} writing: {dev.buffer}")
-        elif req.operation == "read":
-            dev.buffer = "Simulated input"
-            if self.ram.allocate(len(dev.buffer)):
-                print(f"[DEVICE] {dev.name} reading: {dev.buffer}")
-        else:
-            print(f"[ERROR] Unknown operation: {req.operation}")
-
-    def _interrupt_handler(self, dev):
-        """Simula un manejador de interrupciones."""
-        print(f"[INTERRUPT] Operation completed on {dev.name}.")
-        self.ram.free(len(dev.buffer))
+        # enqueue_io solo admite operaciones presentes en la tabla
+        self._drivers[batch[0].operation](dev, batch)
+
+    def _write_driver(self, dev, batch):
+        """Driver de escritura: copia al buffer los datos del lote."""
+        dev.buffer = "".join(r.data for r in batch)[:self.BUFFER_SIZE]
+        if self._allocate_buffer(dev):
+            log.debug("[DEVICE] %s writing (%d request(s)): %s", dev.name, len(batch), dev.buffer)
+
+    def _read_driver(self, dev, batch):
+        """Driver de lectura: llena el buffer con la entrada simulada."""
+        dev.buffer = "Simulated input"
+        if self._allocate_buffer(dev):
+            log.debug("[DEVICE] %s reading (%d request(s)): %s", dev.name, len(batch), dev.buffer)
+
+    def _allocate_buffer(self, dev):
+        """
+        Asigna un bloque de RAM al buffer del dispositivo. Si el pool está
+        agotado, primero notifica las interrupciones pendientes para recuperar
+        los bloques retenidos.
+        """
+        if self._pending_blocks and not self.ram.free_blocks:
+            self._flush_interrupts(force=True)
+        blk = self.ram.allocate(len(dev.buffer))
+        if blk is None:
+            return False
+        self._ram_blocks[dev.name] = blk
+        return True
+
+    def _interrupt_handler(self, device_id):
+        """
+        Simula un manejador de interrupciones.
+
+        La finalización se acumula y la liberación de RAM se difiere a
+        `_flush_interrupts`, que agrupa varias interrupciones en una sola.
+        Si había solicitudes esperando al dispositivo, la primera pasa al
+        frente de la cola.
+        """
+        dev = self.devices[device_id]
+        if not self._pending_completions:
+            self._first_pending_ts = time.monotonic()
+        blk = self._ram_blocks.pop(dev.name, None)
+        if blk is not None:
+            self._pending_blocks.append(blk)
+        self._pending_completions.append(dev.name)
         dev.buffer = ""
         dev.busy = False
+        waiting = self._waiters[device_id]
+        if waiting:
+            self.io_queue.appendleft(waiting.popleft())
+        self._flush_interrupts()
+
+    def _flush_interrupts(self, force=False):
+        """
+        Notifica en bloque las interrupciones acumuladas.
+
+        Se dispara al alcanzar COALESCE_COUNT finalizaciones o cuando la más
+        antigua supera COALESCE_USECS de espera (o siempre, con `force`).
+        """
+        if not self._pending_completions:
+            return
+        if not force and len(self._pending_completions) < self.COALESCE_COUNT \
+                and time.monotonic() - self._first_pending_ts < self.COALESCE_USECS / 1e6:
+            return
+        completed = self._pending_completions
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[INTERRUPT] %d operation(s) completed on %s.", len(completed), ", ".join(completed))
+        if self._pending_blocks:
+            self.ram.free(*self._pending_blocks)
+            self._pending_blocks = []
+        self._pending_completions = []
 
     def run(self, delay=1):
         """Ejecuta el simulador procesando las solicitudes de la cola."""
         while self.io_queue:
             self.handle_io()
+            self._flush_interrupts()
             time.sleep(delay)
+        self._flush_interrupts(force=True)
+
+    async def run_async(self, delay=1):
+        """
+        Versión asíncrona de `run`: la espera entre solicitudes cede el control
+        al bucle de eventos, de modo que varios simuladores pueden procesar sus
+        colas de forma concurrente en un mismo hilo.
+        """
+        while self.io_queue:
+            self.handle_io()
+            self._flush_interrupts()
+            await asyncio.sleep(delay)
+        self._flush_interrupts(force=True)
 
     def status_report(self):
         """Muestra un resumen del estado actual del sistema."""
+        self._flush_interrupts(force=True)
         print("\n=== DEVICE STATUS ===")
         for i, dev in enumerate(self.devices):
             state = "Busy" if dev.busy else "Idle"
             print(f"{i}. {dev.name}: {state}")
-        print(f"[RAM] Usage: {self.ram.used}/{self.ram.size} bytes")
-        print(f"[QUEUE] Pending: {len(self.io_queue)}\n")
+        print(f"[RAM] Usage: {self.ram.used}/{self.ram.size} bytes "
+              f"(fragmentation: {self.ram.fragmentation:.0%})")
+        waiting = sum(len(w) for w in self._waiters.values())
+        print(f"[QUEUE] Pending: {len(self.io_queue)} (waiting on busy devices: {waiting})\n")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     simulator = DeviceDriverSimulator()
 
     print("=== Simulación de Dispositivos ===")
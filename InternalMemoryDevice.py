@@ -1,117 +1,57 @@
-import random
-import time
+import functools
+import logging
 import threading
-from collections import OrderedDict
+from BlockDeviceBase import BlockDeviceBase
 
-class InternalMemoryDevice:
+log = logging.getLogger(__name__)
+
+class InternalMemoryDevice(BlockDeviceBase):
     """
     Simulación avanzada de un dispositivo de memoria interna (SSD o RAM persistente).
     Maneja bloques de memoria, errores, caché LRU y latencia realista.
     """
-    def __init__(self, name="SSD Interno", capacity=4096, block_size=256, cache_size=4):
-        self.name = name
-        self.block_size = block_size
-        self.total_blocks = capacity // block_size
-        self.storage = [""] * self.total_blocks
-        self.block_state = ["free"] * self.total_blocks
-        self.lock = threading.Lock()
-
-        # Simulación de caché con LRU
-        self.cache = OrderedDict()
-        self.cache_size = cache_size
-
-        # Probabilidad de error simulada (por bloque)
-        self.failure_chance = 0.05  # 5%
+    __slots__ = ("lock", "cache_size", "_versions", "_cached_read")
 
-        print(f"[INIT] {self.name} initialized with {self.total_blocks} blocks.")
+    READ_FAILURE = "[BLOCK READ FAILURE]"
 
-    def simulate_latency(self, min_ms=10, max_ms=100):
-        """Simula latencia del dispositivo en ms."""
-        delay = random.uniform(min_ms, max_ms) / 1000.0
-        time.sleep(delay)
-
-    def simulate_failure(self):
-        """Simula un posible fallo de hardware."""
-        return random.random() < self.failure_chance
+    def __init__(self, name="SSD Interno", capacity=4096, block_size=256, cache_size=4, seed=None):
+        super().__init__(name, capacity, block_size, failure_chance=0.05, seed=seed)  # 5%
+        # La latencia simulada se espera fuera del candado: el candado solo
+        # protege la actualización del bloque y de la caché.
+        self.lock = threading.Lock()
 
-    def write_block(self, block_num, data):
-        """
-        Escribe datos en un bloque específico.
+        # Simulación de caché con LRU (implementada en C por functools). La clave
+        # incluye la versión del bloque: una escritura la incrementa, de modo que
+        # solo se invalida ese bloque; la entrada antigua ya no se consulta y
+        # sale por LRU.
+        self.cache_size = cache_size
+        self._versions = [0] * self.total_blocks
+        self._cached_read = functools.lru_cache(maxsize=cache_size)(self._read_version)
 
-        Args:
-            block_num (int): Número del bloque.
-            data (str): Datos a escribir.
+        log.info("[INIT] %s initialized with %d blocks.", self.name, self.total_blocks)
 
-        Returns:
-            bool: True si tuvo éxito, False si hubo error simulado.
-        """
+    def _commit(self, block_num, data):
         with self.lock:
-            self.simulate_latency()
-
-            if block_num >= self.total_blocks:
-                print(f"[ERROR] {self.name}: Block {block_num} out of range.")
-                return False
-
-            if self.simulate_failure():
-                print(f"[FAILURE] {self.name}: Write failure on block {block_num}!")
-                return False
+            super()._commit(block_num, data)
+            self._versions[block_num] += 1
+            # Cargar el bloque recién escrito: la siguiente lectura es un acierto
+            self._cached_read(block_num, self._versions[block_num])
 
-            self.storage[block_num] = data[:self.block_size]
-            self.block_state[block_num] = "used"
-
-            # Actualizar caché
-            self._update_cache(block_num, data[:self.block_size])
-
-            print(f"[WRITE] {self.name}: Block {block_num} <- '{data[:30]}...'")
-            return True
-
-    def read_block(self, block_num):
-        """
-        Lee los datos de un bloque específico.
-
-        Args:
-            block_num (int): Número del bloque.
-
-        Returns:
-            str: Contenido del bloque o mensaje de error.
-        """
+    def _fetch(self, block_num):
+        # Lectura a través de la caché; los aciertos se reportan en status()
         with self.lock:
-            self.simulate_latency()
-
-            if block_num >= self.total_blocks:
-                print(f"[ERROR] {self.name}: Block {block_num} out of range.")
-                return ""
-
-            if self.simulate_failure():
-                print(f"[FAILURE] {self.name}: Read failure on block {block_num}!")
-                return "[BLOCK READ FAILURE]"
-
-            # Intentar lectura desde caché
-            if block_num in self.cache:
-                data = self.cache[block_num]
-                print(f"[CACHE HIT] {self.name}: Block {block_num} -> '{data[:30]}...'")
-                self.cache.move_to_end(block_num)
-                return data
-
-            # Si no está en caché, leer de almacenamiento y guardar en caché
-            data = self.storage[block_num]
-            self._update_cache(block_num, data)
-            print(f"[READ] {self.name}: Block {block_num} -> '{data[:30]}...'")
-            return data
+            return self._cached_read(block_num, self._versions[block_num])
 
-    def _update_cache(self, block_num, data):
-        """Mantiene la caché LRU al día."""
-        if block_num in self.cache:
-            self.cache.move_to_end(block_num)
-        else:
-            if len(self.cache) >= self.cache_size:
-                evicted = self.cache.popitem(last=False)
-                print(f"[CACHE EVICT] {self.name}: Block {evicted[0]}")
-            self.cache[block_num] = data
+    def _read_version(self, block_num, version):
+        """Lectura de almacenamiento cacheable; `version` solo forma parte de la clave."""
+        return self._read_from_storage(block_num)
 
     def status(self):
         """Muestra un resumen del estado de la memoria."""
-        used = self.block_state.count("used")
+        used = self._used_count
         print(f"\n[{self.name}] STATUS")
         print(f"Blocks used: {used}/{self.total_blocks}")
-        print(f"Cache: {[k for k in self.cache.keys()]}\n")
\ No newline at end of file
+        info = self._cached_read.cache_info()
+        # Las cargas hechas al escribir cuentan como misses
+        print(f"Cache: {info.currsize}/{info.maxsize} entries "
+              f"(hits: {info.hits}, misses: {info.misses})\n")
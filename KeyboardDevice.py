@@ -1,9 +1,11 @@
+import logging
 import threading
-import time
 import keyboard  # pip install keyboard
-from collections import deque
+from queue import SimpleQueue, Empty
 from DeviceDriverSimulator import DeviceDriverSimulator
 
+log = logging.getLogger(__name__)
+
 class KeyboardDriverSimulator(DeviceDriverSimulator.Device):
     """
     Simula un driver de teclado con interrupciones, buffer de entrada,
@@ -11,58 +13,104 @@ class KeyboardDriverSimulator(DeviceDriverSimulator.Device):
     """
     def __init__(self, name="Keyboard", buffer_size=20):
         super().__init__(name)
-        self.buffer = deque(maxlen=buffer_size)
-        self.running = False
-        self.lock = threading.Lock()
+        self.buffer = SimpleQueue()
+        self.buffer_size = buffer_size
+        self._stop_event = threading.Event()
 
     def _keyboard_interrupt(self, event):
         """
         Función manejadora de interrupciones. Se activa en cada evento de teclado.
 
+        Como la mitad superior de una interrupción real, solo encola el evento;
+        el procesamiento se difiere al lector, que vacía el buffer por lotes.
+
         Args:
             event: Evento de tecla (tecla presionada o soltada)
         """
-        with self.lock:
-            self.buffer.append({
-                "key": event.name,
-                "event_type": event.event_type,  # 'down' o 'up'
-                "timestamp": time.time()
-            })
-            print(f"[INTERRUPT] {event.event_type.upper()} - '{event.name}'")
+        self._push({
+            "key": event.name,
+            "event_type": event.event_type,  # 'down' o 'up'
+            "timestamp": event.time
+        })
+        if event.name == "esc" and event.event_type == "down":
+            self.stop()
+
+    def _push(self, entry):
+        """Encola sin bloquear; si el buffer está lleno se descarta el evento más antiguo."""
+        while self.buffer.qsize() >= self.buffer_size:
+            try:
+                self.buffer.get_nowait()
+            except Empty:
+                break
+        self.buffer.put(entry)
 
     def start(self):
         """Inicia la simulación del driver y captura de eventos."""
-        self.running = True
+        self._stop_event.clear()
         keyboard.hook(self._keyboard_interrupt)
-        print("[KEYBOARD DRIVER] Listening to keyboard. Press ESC to stop.")
-        
+        log.info("[KEYBOARD DRIVER] Listening to keyboard. Press ESC to stop.")
+
         try:
-            while self.running:
-                if keyboard.is_pressed('esc'):
-                    self.running = False
-                time.sleep(0.05)
+            # La interrupción de ESC despierta este hilo; el timeout solo sirve
+            # para que Ctrl+C pueda interrumpir la espera (en Windows una espera
+            # sin timeout no es interrumpible).
+            while not self._stop_event.wait(0.5):
+                pass
         except KeyboardInterrupt:
-            self.running = False
+            pass
         finally:
             keyboard.unhook_all()
-            print("[KEYBOARD DRIVER] Stopped.")
+            self.stop()
+            log.info("[KEYBOARD DRIVER] Stopped.")
+
+    def stop(self):
+        """Detiene el driver y despierta al lector bloqueado con un centinela."""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        self._push(None)
+
+    def read_event(self):
+        """
+        Espera (bloqueando) el siguiente evento del buffer.
+
+        Returns:
+            dict | None: Evento de tecla, o None si el driver se detuvo.
+        """
+        entry = self.buffer.get()
+        if entry is not None:
+            self._log_entry(entry)
+        return entry
 
     def read_buffer(self):
-        """Simula la lectura del buffer desde el sistema operativo."""
-        with self.lock:
-            while self.buffer:
-                entry = self.buffer.popleft()
-                print(f"[READ] {entry['event_type'].upper()} '{entry['key']}' at {entry['timestamp']}")
+        """
+        Simula la lectura del buffer desde el sistema operativo (sin bloquear).
+        Despacha en un solo lote todos los eventos pendientes.
+        """
+        while True:
+            try:
+                entry = self.buffer.get_nowait()
+            except Empty:
+                return
+            if entry is None:
+                # Se conserva el centinela para el lector bloqueado
+                self._push(None)
+                return
+            self._log_entry(entry)
+
+    @staticmethod
+    def _log_entry(entry):
+        log.debug("[READ] %s '%s' at %s", entry["event_type"].upper(), entry["key"], entry["timestamp"])
 
 # --- Simulación en ejecución separada ---
 
 def os_reader(driver):
     """Simula el sistema operativo leyendo del driver de teclado."""
-    while driver.running:
-        driver.read_buffer()
-        time.sleep(1)  # Simula latencia del sistema
+    while driver.read_event() is not None:
+        pass
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     driver = KeyboardDriverSimulator()
 
     # Hilo para el lector del SO